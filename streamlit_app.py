@@ -1,17 +1,65 @@
+import csv
 import io
+import os
+import tempfile
+import threading
 import zipfile
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Literal, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from PIL import Image, ImageDraw, ImageFont
 
 from barcode import Code128
-from barcode.writer import ImageWriter
+from barcode.writer import SVGWriter
+
+
+# Physical barcode geometry (millimetres)
+MODULE_WIDTH_MM = 0.2     # width of narrow bar
+MODULE_HEIGHT_MM = 12.0   # bar height (not insanely tall)
+QUIET_ZONE_MM = 10.0      # margin left/right so nothing is cut off
+MARGIN_MM = 1.0           # margin above and below the bars
+
+# Keep barcodes as text: no numeric coercion (e.g. leading zeros) or NaNs
+CSV_READ_OPTIONS = {"engine": "c", "dtype": str, "keep_default_na": False}
+
+# Explicit libjpeg settings: single-scan baseline, no extra Huffman pass,
+# 4:2:0 chroma subsampling (only relevant if a colour image is ever saved)
+JPEG_SAVE_OPTIONS = {
+    "format": "JPEG",
+    "quality": 85,
+    "optimize": False,
+    "progressive": False,
+    "subsampling": 2,
+}
+
+# Code128 only needs a writer to render; we just call build(), so share one
+# instead of letting every instance construct its default SVGWriter
+_BUILD_WRITER = SVGWriter()
+
+# Lookup table from module characters ('0'/'1') to grey levels
+_MODULE_COLOURS = np.full(256, 255, dtype=np.uint8)
+_MODULE_COLOURS[ord("1")] = 0
+
+# Vector output: same physical geometry, text drawn by python-barcode
+SVG_WRITER_OPTIONS = {
+    "module_width": MODULE_WIDTH_MM,
+    "module_height": MODULE_HEIGHT_MM,
+    "quiet_zone": QUIET_ZONE_MM,
+    "write_text": True,
+}
+
+# Per-thread scratch state for the render workers
+_thread_local = threading.local()
 
 
 # ------------- Helpers ------------- #
 
+@st.cache_data(show_spinner=False)
 def parse_pasted_data(text: str) -> pd.DataFrame:
     """
     Parse pasted text into a DataFrame.
@@ -22,15 +70,26 @@ def parse_pasted_data(text: str) -> pd.DataFrame:
     if not text.strip():
         return pd.DataFrame()
 
-    # Try tab-separated first, then comma-separated as fallback
+    # Detect tab vs comma once from a sample; default to tab if unsure
     try:
-        df = pd.read_csv(StringIO(text), sep="\t")
-    except Exception:
-        df = pd.read_csv(StringIO(text))
+        sep = csv.Sniffer().sniff(text[:4096], delimiters=",\t").delimiter
+    except csv.Error:
+        sep = "\t"
+
+    df = pd.read_csv(StringIO(text), sep=sep, **CSV_READ_OPTIONS)
 
     return df
 
 
+@st.cache_data(show_spinner=False)
+def _read_uploaded_csv(file_bytes: bytes) -> pd.DataFrame:
+    """
+    Parse an uploaded CSV file.
+    Cached on the raw bytes so widget changes don't re-parse the same upload.
+    """
+    return pd.read_csv(io.BytesIO(file_bytes), **CSV_READ_OPTIONS)
+
+
 def validate_dataframe(df: pd.DataFrame):
     """
     Ensure required columns exist.
@@ -46,160 +105,398 @@ def validate_dataframe(df: pd.DataFrame):
     return True, ""
 
 
-def generate_barcode_image(
+def _mm_to_px(mm: float, dpi: int) -> int:
+    """
+    Convert a length in millimetres to a whole number of pixels (at least 1).
+    """
+    return max(1, int(round(mm * dpi / 25.4)))
+
+
+@lru_cache(maxsize=32)
+def _bar_geometry(dpi: int) -> Tuple[int, int, int, int]:
+    """
+    Pixel sizes (module width, quiet zone, margin, bar height) for a DPI.
+    """
+    return (
+        _mm_to_px(MODULE_WIDTH_MM, dpi),
+        _mm_to_px(QUIET_ZONE_MM, dpi),
+        _mm_to_px(MARGIN_MM, dpi),
+        _mm_to_px(MODULE_HEIGHT_MM, dpi),
+    )
+
+
+def bar_rows(barcode_values: List[str], dpi: int) -> List[np.ndarray]:
+    """
+    Build one pixel row of Code128 bars (quiet zones included) per value.
+
+    All rows are laid out in a single (N, max_width) array, padded with
+    white, so the module lookup and pixel expansion run once for the whole
+    batch. Each returned row is a view trimmed to that barcode's width.
+    """
+    module_px, quiet_px, _, _ = _bar_geometry(dpi)
+
+    bits = [
+        Code128(value, writer=_BUILD_WRITER).build()[0]
+        for value in barcode_values
+    ]
+    max_modules = max((len(b) for b in bits), default=0)
+
+    # Module characters, padded with '0' (white) to the longest barcode
+    chars = np.full((len(bits), max_modules), ord("0"), dtype=np.uint8)
+    for i, b in enumerate(bits):
+        chars[i, : len(b)] = np.frombuffer(b.encode("ascii"), dtype=np.uint8)
+
+    # '1' -> black (0), '0' -> white (255)
+    pixels = np.repeat(_MODULE_COLOURS[chars], module_px, axis=1)
+    pixels = np.pad(pixels, ((0, 0), (quiet_px, quiet_px)), constant_values=255)
+
+    return [
+        pixels[i, : len(b) * module_px + 2 * quiet_px]
+        for i, b in enumerate(bits)
+    ]
+
+
+def render_bars(
     barcode_value: str,
     dpi: int,
-    width_px: Optional[int],
-    height_px: Optional[int],
+    bar_row: Optional[np.ndarray] = None,
 ) -> Image.Image:
     """
-    Generate a PIL Image for a given barcode value.
+    Rasterise the Code128 bars for barcode_value as a greyscale image.
 
-    - Bars and human-readable text are drawn separately.
-    - Text is always fully visible below the bars.
-    - Output can be scaled into a target box while keeping aspect ratio
-      (with white padding if needed).
+    Every module is a whole number of pixels wide, so bars are built with
+    NumPy instead of drawing one rectangle per bar. Pass `bar_row` (from
+    `bar_rows`) to reuse a row already built as part of a batch.
     """
+    if bar_row is None:
+        bar_row = bar_rows([barcode_value], dpi)[0]
 
-    # 1️⃣ Create barcode bars only (no text)
-    buffer = io.BytesIO()
-    code = Code128(barcode_value, writer=ImageWriter())
-    code.write(
-        buffer,
-        {
-            "format": "JPEG",
-            "dpi": dpi,
-            "module_width": 0.2,     # width of narrow bar
-            "module_height": 12.0,   # bar height (not insanely tall)
-            "quiet_zone": 10.0,      # margin left/right so nothing is cut off
-            "write_text": False,     # IMPORTANT: we draw text ourselves
-        },
-    )
-    buffer.seek(0)
-    barcode_img = Image.open(buffer).convert("RGB")
+    _, _, margin_px, bar_h = _bar_geometry(dpi)
 
-    # 2️⃣ Create a text strip underneath
-    # Use default font (no external files needed)
+    pixels = np.broadcast_to(bar_row, (bar_h, bar_row.size))
+    pixels = np.pad(pixels, ((margin_px, margin_px), (0, 0)), constant_values=255)
+
+    return Image.fromarray(pixels, mode="L")
+
+
+@lru_cache(maxsize=8)
+def _get_font(size: int) -> ImageFont.ImageFont:
+    """
+    Load the label font once per size instead of once per barcode.
+    """
     try:
-        font = ImageFont.truetype("arial.ttf", 24)   # if available
-    except:
-        # Fallback: scale default bitmap font manually
-        font = ImageFont.load_default()
+        return ImageFont.truetype("arial.ttf", size)   # if available
+    except OSError:
+        # Fallback: default bitmap font (no external files needed)
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1024)
+def _text_label(text: str) -> Image.Image:
+    """
+    Render the human-readable text shown under the bars, padded but only
+    as wide as the text itself (it is centred under the bars when pasted).
+
+    Cached per text, so the returned image is shared and must not be
+    modified by callers.
+    """
+    font = _get_font(24)
 
     # Measure text size
-    dummy_img = Image.new("RGB", (1, 1))
-    draw_dummy = ImageDraw.Draw(dummy_img)
-    bbox = draw_dummy.textbbox((0, 0), barcode_value, font=font)
-    text_w = bbox[2] - bbox[0]
-    text_h = bbox[3] - bbox[1]
+    left, top, right, bottom = font.getbbox(text)
+    text_w = right - left
+    text_h = bottom - top
 
     # Add some horizontal padding so digits don't touch edge
     text_padding_x = 10
     text_padding_y = 5
 
-    # Text strip width should match at least the barcode width
-    bar_w, bar_h = barcode_img.size
-    text_strip_w = max(bar_w, text_w + 2 * text_padding_x)
-    text_strip_h = text_h + 2 * text_padding_y
+    label = Image.new(
+        "L", (text_w + 2 * text_padding_x, text_h + 2 * text_padding_y), 255
+    )
+    draw_text = ImageDraw.Draw(label)
+    draw_text.text((text_padding_x, text_padding_y), text, fill="black", font=font)
+
+    return label
+
+
+def _get_canvas(width: int, height: int) -> Image.Image:
+    """
+    Return this thread's pooled white canvas of the given size.
+
+    A batch normally uses one target size, so this avoids allocating a new
+    canvas per barcode. The image is cleared and handed out again on the
+    next call with the same size, so callers must not hold on to it.
+    """
+    pool = getattr(_thread_local, "canvases", None)
+    if pool is None:
+        pool = _thread_local.canvases = {}
+
+    canvas = pool.get((width, height))
+    if canvas is None:
+        canvas = pool[(width, height)] = Image.new("L", (width, height), 255)
+    else:
+        canvas.paste(255, (0, 0, width, height))
+    return canvas
+
+
+def generate_barcode_image(
+    barcode_value: str,
+    dpi: int,
+    width_px: Optional[int],
+    height_px: Optional[int],
+    bar_row: Optional[np.ndarray] = None,
+    reuse_canvas: bool = False,
+) -> Image.Image:
+    """
+    Generate a greyscale PIL Image for a given barcode value.
 
-    text_img = Image.new("RGB", (text_strip_w, text_strip_h), "white")
-    draw_text = ImageDraw.Draw(text_img)
+    - Bars and human-readable text are drawn separately.
+    - Text is always fully visible below the bars.
+    - Output can be scaled into a target box while keeping aspect ratio
+      (with white padding if needed).
+
+    With reuse_canvas=True a sized output is drawn on this thread's pooled
+    canvas (see `_get_canvas`): use it before the next call on the same
+    thread, or copy() it.
+    """
+
+    # 1️⃣ Create barcode bars only (no text)
+    barcode_img = render_bars(barcode_value, dpi, bar_row)
 
-    # Center text horizontally
-    text_x = (text_strip_w - text_w) // 2
-    text_y = text_padding_y
-    draw_text.text((text_x, text_y), barcode_value, fill="black", font=font)
+    # 2️⃣ Create a text strip underneath
+    bar_w, bar_h = barcode_img.size
+    text_img = _text_label(barcode_value)
+    text_w, text_h = text_img.size
 
-    # 3️⃣ Combine barcode + text vertically
-    combined_w = max(bar_w, text_strip_w)
-    combined_h = bar_h + text_strip_h
-    combined = Image.new("RGB", (combined_w, combined_h), "white")
+    # 3️⃣ Lay out barcode + text vertically, centred horizontally
+    #    (text strip is at least as wide as the bars; white comes from
+    #    the background, so only the tight label is pasted)
+    combined_w = max(bar_w, text_w)
+    combined_h = bar_h + text_h
 
-    # Center barcode and text horizontally
     bar_x = (combined_w - bar_w) // 2
-    text_x_offset = (combined_w - text_strip_w) // 2
+    text_x_offset = (combined_w - text_w) // 2
 
-    combined.paste(barcode_img, (bar_x, 0))
-    combined.paste(text_img, (text_x_offset, bar_h))
+    # Bars are piecewise constant, so NEAREST keeps edges hard (no ringing);
+    # only the anti-aliased text needs LANCZOS.
+    parts = [
+        (barcode_img, bar_x, 0, Image.NEAREST),
+        (text_img, text_x_offset, bar_h, Image.LANCZOS),
+    ]
 
     # 4️⃣ If no target size -> return combined as-is
     if not width_px and not height_px:
+        combined = Image.new("L", (combined_w, combined_h), 255)
+        for part, x, y, _ in parts:
+            combined.paste(part, (x, y))
         return combined
 
-    orig_w, orig_h = combined.size
-
     # 5️⃣ Scale while keeping aspect ratio
     if width_px and height_px:
-        scale = min(width_px / orig_w, height_px / orig_h)
-        new_w = max(1, int(orig_w * scale))
-        new_h = max(1, int(orig_h * scale))
-    elif width_px and not height_px:
-        scale = width_px / orig_w
+        scale = min(width_px / combined_w, height_px / combined_h)
+        new_w = max(1, int(combined_w * scale))
+        new_h = max(1, int(combined_h * scale))
+    elif width_px:
+        scale = width_px / combined_w
         new_w = width_px
-        new_h = max(1, int(orig_h * scale))
-    elif height_px and not width_px:
-        scale = height_px / orig_h
-        new_h = height_px
-        new_w = max(1, int(orig_w * scale))
+        new_h = max(1, int(combined_h * scale))
     else:
-        # Shouldn't hit this, but just in case
-        return combined
-
-    resized = combined.resize((new_w, new_h), Image.LANCZOS)
+        scale = height_px / combined_h
+        new_h = height_px
+        new_w = max(1, int(combined_w * scale))
 
-    # 6️⃣ Paste onto exact-size white canvas (no cropping)
+    # 6️⃣ Resize each part straight onto the exact-size white canvas
+    #    (no cropping, no intermediate full-size composite)
     canvas_w = width_px if width_px else new_w
     canvas_h = height_px if height_px else new_h
-    canvas = Image.new("RGB", (canvas_w, canvas_h), "white")
+    if reuse_canvas:
+        canvas = _get_canvas(canvas_w, canvas_h)
+    else:
+        canvas = Image.new("L", (canvas_w, canvas_h), 255)
 
     offset_x = (canvas_w - new_w) // 2
     offset_y = (canvas_h - new_h) // 2
-    canvas.paste(resized, (offset_x, offset_y))
+    scale_x = new_w / combined_w
+    scale_y = new_h / combined_h
+
+    for part, x, y, resample in parts:
+        # Scale both edges so neighbouring parts still meet exactly
+        left, top = round(x * scale_x), round(y * scale_y)
+        right = round((x + part.width) * scale_x)
+        bottom = round((y + part.height) * scale_y)
+        size = (max(1, right - left), max(1, bottom - top))
+        canvas.paste(
+            part.resize(size, resample),
+            (offset_x + left, offset_y + top),
+        )
 
     return canvas
 
 
-def create_zip_of_barcodes(
-    df: pd.DataFrame,
+def _jpeg_buffer() -> io.BytesIO:
+    """
+    Return this thread's reusable encode buffer, emptied.
+    Avoids allocating a fresh BytesIO for every barcode.
+    """
+    buffer = getattr(_thread_local, "jpeg_buffer", None)
+    if buffer is None:
+        buffer = _thread_local.jpeg_buffer = io.BytesIO()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return buffer
+
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _render_jpeg_bytes(
+    barcode_value: str,
     dpi: int,
     width_px: Optional[int],
     height_px: Optional[int],
+    _bar_row: Optional[np.ndarray] = None,
 ) -> bytes:
     """
-    Generate a ZIP file (as bytes) containing one JPEG per row in df.
-    JPEG file names are taken from 'JPEG Name' column.
+    Render a barcode to JPEG bytes.
+    Cached so duplicate barcodes (and the preview) are only rendered once.
+
+    `_bar_row` is derived from (barcode_value, dpi), so the leading
+    underscore keeps it out of the cache key.
+    """
+    img = generate_barcode_image(
+        barcode_value=barcode_value,
+        dpi=dpi,
+        width_px=width_px,
+        height_px=height_px,
+        bar_row=_bar_row,
+        # Encoded straight away below, so the pooled canvas is safe to use
+        reuse_canvas=True,
+    )
+
+    img_bytes = _jpeg_buffer()
+    img.save(img_bytes, **JPEG_SAVE_OPTIONS)
+    return img_bytes.getvalue()
+
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _render_svg_bytes(barcode_value: str) -> bytes:
+    """
+    Render a barcode to SVG bytes (no rasterisation).
+    """
+    buffer = io.BytesIO()
+    # SVGWriter keeps per-render state, so each call gets its own
+    code = Code128(barcode_value, writer=SVGWriter())
+    code.write(buffer, SVG_WRITER_OPTIONS)
+    return buffer.getvalue()
+
+
+def _archive_name(name: str, ext: str) -> str:
+    """
+    Append the file extension to name unless it is already there.
+    """
+    return name if name.lower().endswith(f".{ext}") else f"{name}.{ext}"
+
+
+def _render_one(
+    args: Tuple[str, str, int, Optional[int], Optional[int], np.ndarray],
+) -> Tuple[str, bytes]:
+    """
+    Render a single barcode row to JPEG bytes (runs on a worker thread).
+    """
+    barcode_value, jpeg_name, dpi, width_px, height_px, bar_row = args
+
+    data = _render_jpeg_bytes(barcode_value, dpi, width_px, height_px, bar_row)
+
+    return _archive_name(jpeg_name, "jpg"), data
+
+
+def _render_one_svg(args: Tuple[str, str]) -> Tuple[str, bytes]:
+    """
+    Render a single barcode row to SVG bytes (runs on a worker thread).
+    """
+    barcode_value, jpeg_name = args
+
+    # Names may already carry a JPEG extension (accepted for JPEG output)
+    stem, ext = os.path.splitext(jpeg_name)
+    if ext.lower() in (".jpg", ".jpeg"):
+        jpeg_name = stem
+
+    return _archive_name(jpeg_name, "svg"), _render_svg_bytes(barcode_value)
+
+
+def create_zip_of_barcodes(
+    df: pd.DataFrame,
+    dpi: int,
+    width_px: Optional[int],
+    height_px: Optional[int],
+    compress: bool = False,
+    preview_n: int = 3,
+    output_format: Literal["jpg", "svg"] = "jpg",
+) -> Tuple[str, List[Tuple[str, str, bytes]]]:
     """
-    zip_buffer = io.BytesIO()
+    Generate a ZIP file containing one image per row in df.
+    File names are taken from 'JPEG Name' column.
+
+    With output_format="svg", barcodes are written as vector SVGs and
+    dpi/width_px/height_px are ignored.
 
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for _, row in df.iterrows():
-            barcode_value = str(row["Barcode"]).strip()
-            jpeg_name = str(row["JPEG Name"]).strip()
+    Returns the ZIP path plus (filename, barcode_value, image_bytes) for the
+    first `preview_n` barcodes, so the UI can preview without re-rendering.
 
-            if not barcode_value or not jpeg_name:
-                continue
+    The archive is written to a temporary file rather than held in memory;
+    the caller is responsible for deleting it.
 
-            img = generate_barcode_image(
-                barcode_value=barcode_value,
-                dpi=dpi,
-                width_px=width_px,
-                height_px=height_px,
-            )
+    JPEGs are already compressed, so entries are stored as-is unless
+    `compress` is set.
 
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format="JPEG")
-            img_bytes.seek(0)
+    Rows are rendered on a thread pool (PIL and libjpeg release the GIL);
+    the ZIP itself is written on this thread, in the original row order,
+    because zipfile is not thread-safe.
+    """
+    barcodes = df["Barcode"].astype(str).str.strip().to_numpy()
+    jpeg_names = df["JPEG Name"].astype(str).str.strip().to_numpy()
+
+    rows = [
+        (barcode_value, jpeg_name)
+        for barcode_value, jpeg_name in zip(barcodes, jpeg_names)
+        if barcode_value and jpeg_name
+    ]
+
+    if output_format == "svg":
+        render, jobs = _render_one_svg, rows
+    else:
+        # Build every bar pattern in one batch, then render rows from slices
+        bars = bar_rows([barcode_value for barcode_value, _ in rows], dpi)
 
-            filename = (
-                f"{jpeg_name}.jpg"
-                if not jpeg_name.lower().endswith(".jpg")
-                else jpeg_name
-            )
+        render = _render_one
+        jobs = [
+            (barcode_value, jpeg_name, dpi, width_px, height_px, bar_row)
+            for (barcode_value, jpeg_name), bar_row in zip(rows, bars)
+        ]
 
-            zipf.writestr(filename, img_bytes.read())
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    previews = []
 
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
+        try:
+            with zipfile.ZipFile(tmp, "w", compression) as zipf:
+                with ThreadPoolExecutor(
+                    max_workers=min(8, os.cpu_count() or 1),
+                    # Let workers use st.cache_data without context warnings
+                    initializer=add_script_run_ctx,
+                    initargs=(None, get_script_run_ctx()),
+                ) as executor:
+                    results = executor.map(render, jobs)
+                    for i, (filename, data) in enumerate(results):
+                        zipf.writestr(filename, data)
+                        if i < preview_n:
+                            previews.append((filename, jobs[i][0], data))
+        except BaseException:
+            # Includes interrupts, so a partial archive is never left behind
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+
+    return tmp.name, previews
 
 
 # ------------- Streamlit UI ------------- #
@@ -242,7 +539,7 @@ with tab_csv:
     uploaded_file = st.file_uploader("Upload CSV file", type=["csv"])
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
+            df = _read_uploaded_csv(uploaded_file.getvalue())
         except Exception as e:
             st.error(f"Error reading CSV file: {e}")
 
@@ -318,42 +615,63 @@ if resize_option == "Custom (pixels)":
             step=10,
         )
 
+output_format = "jpg"
+
+if resize_option == "Auto":
+    format_label = st.radio(
+        "Output format",
+        ["JPEG", "SVG (vector)"],
+        horizontal=True,
+        help="SVG skips rasterising entirely; DPI does not apply",
+    )
+    if format_label == "SVG (vector)":
+        output_format = "svg"
+
+file_label = "SVGs" if output_format == "svg" else "JPEGs"
+
+compress_zip = st.checkbox(
+    "Compress archive (slower)",
+    value=False,
+    help="JPEGs are already compressed, so this mostly helps SVG output",
+)
+
 st.header("3. Generate barcodes")
 
 if valid:
-    if st.button("🚀 Generate JPEGs & create ZIP"):
+    if st.button(f"🚀 Generate {file_label} & create ZIP"):
         with st.spinner("Generating barcodes..."):
             try:
-                zip_bytes = create_zip_of_barcodes(
+                zip_path, previews = create_zip_of_barcodes(
                     df=df,
                     dpi=dpi,
                     width_px=width_px,
                     height_px=height_px,
+                    compress=compress_zip,
+                    output_format=output_format,
                 )
 
-                st.success("Barcodes generated successfully!")
-
-                st.download_button(
-                    label="⬇️ Download ZIP of JPEGs",
-                    data=zip_bytes,
-                    file_name="barcodes_jpegs.zip",
-                    mime="application/zip",
-                )
+                # Open the try straight away: any st.* call can raise a
+                # pending rerun/stop, and the temp file must still go
+                try:
+                    st.success("Barcodes generated successfully!")
+
+                    with open(zip_path, "rb") as zip_file:
+                        st.download_button(
+                            label=f"⬇️ Download ZIP of {file_label}",
+                            data=zip_file,
+                            file_name=f"barcodes_{file_label.lower()}.zip",
+                            mime="application/zip",
+                        )
+                finally:
+                    os.remove(zip_path)
 
                 st.subheader("Preview (first few barcodes)")
-                for _, row in df.head(3).iterrows():
-                    barcode_value = str(row["Barcode"]).strip()
-                    jpeg_name = str(row["JPEG Name"]).strip()
-                    if not barcode_value or not jpeg_name:
-                        continue
-                    img = generate_barcode_image(
-                        barcode_value=barcode_value,
-                        dpi=dpi,
-                        width_px=width_px,
-                        height_px=height_px,
-                    )
-                    st.caption(f"`{jpeg_name}.jpg` — {barcode_value}")
-                    st.image(img)
+                for filename, barcode_value, img_bytes in previews:
+                    st.caption(f"`{filename}` — {barcode_value}")
+                    if output_format == "svg":
+                        st.image(img_bytes.decode("utf-8"))
+                    else:
+                        st.image(img_bytes)
 
             except Exception as e:
                 st.error(f"Error generating barcodes: {e}")